@@ -26,6 +26,12 @@ import asyncio
 
 import oef.agents
 
+try:
+    import uvloop
+    uvloop.install()
+except ImportError:
+    pass
+
 parser = argparse.ArgumentParser("oef_healthcheck", description=__doc__)
 parser.add_argument("addr", type=str, help="IP address of the OEF node.")
 parser.add_argument("port", type=int, help="Port of the OEF node.")
@@ -37,7 +43,9 @@ if __name__ == '__main__':
         port = args.port
         pbk = 'check'
         print("Connecting to {}:{}".format(host, port))
-        agent = oef.agents.OEFAgent(pbk, host, port, loop=asyncio.get_event_loop())
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        agent = oef.agents.OEFAgent(pbk, host, port, loop=loop)
         agent.connect()
         agent.disconnect()
         print("OK!")
@@ -32,7 +32,7 @@ from oef.query import Query, Constraint, GtEq
 
 from tac.agents.v1.agent import Liveness
 from tac.agents.v1.base.interfaces import ControllerActionInterface, OEFSearchActionInterface, DialogueActionInterface
-from tac.agents.v1.base.game_instance import GameInstance
+from tac.agents.v1.base.game_instance import GameInstance, SearchRole
 from tac.agents.v1.mail import OutBox, OutContainer
 from tac.helpers.crypto import Crypto
 from tac.platform.protocol import GetStateUpdate
@@ -103,7 +103,7 @@ class OEFActions(OEFSearchActionInterface):
         """
         query = Query([Constraint("version", GtEq(1))])
         search_id = self.game_instance.search.get_next_id()
-        self.game_instance.search.ids_for_tac.add(search_id)
+        self.game_instance.search.register(search_id, SearchRole.TAC)
         self.out_box.out_queue.put(OutContainer(query=query, search_id=search_id))
 
     def update_services(self) -> None:
@@ -167,7 +167,7 @@ class OEFActions(OEFSearchActionInterface):
             else:
                 logger.debug("[{}]: Searching for sellers which match the demand of the agent.".format(self.agent_name))
                 search_id = self.game_instance.search.get_next_id()
-                self.game_instance.search.ids_for_sellers.add(search_id)
+                self.game_instance.search.register(search_id, SearchRole.SELLERS)
                 self.out_box.out_queue.put(OutContainer(query=query, search_id=search_id))
         if self.game_instance.strategy.is_searching_for_buyers:
             query = self.game_instance.build_services_query(is_searching_for_sellers=False)
@@ -177,7 +177,7 @@ class OEFActions(OEFSearchActionInterface):
             else:
                 logger.debug("[{}]: Searching for buyers which match the supply of the agent.".format(self.agent_name))
                 search_id = self.game_instance.search.get_next_id()
-                self.game_instance.search.ids_for_buyers.add(search_id)
+                self.game_instance.search.register(search_id, SearchRole.BUYERS)
                 self.out_box.out_queue.put(OutContainer(query=query, search_id=search_id))
 
 
@@ -21,11 +21,16 @@
 """This class manages the state and some services related to the TAC for an agent."""
 
 import datetime
-from enum import Enum
-from typing import List, Optional, Set
+import itertools
+import time
+from collections import OrderedDict
+from enum import Enum, IntEnum
+from typing import Dict, List, Optional, Set, Tuple
+
+import numpy as np
 
 from oef.messages import CFP_TYPES
-from oef.query import Query
+from oef.query import And, Constraint, Eq, Gt, GtEq, Lt, LtEq, NotEq, Or, Query, Range
 from oef.schema import Description
 
 from tac.agents.v1.mail import MailStats
@@ -39,6 +44,89 @@ from tac.helpers.misc import build_query, get_goods_quantities_description
 from tac.platform.protocol import GameData, StateUpdate
 
 
+SERVICES_CACHE_SIZE = 32
+STRATEGY_CACHE_SIZE = 64
+
+
+def _constraint_mask(constraint_expr, candidate_proposals: List[Description]) -> Optional[np.ndarray]:
+    """
+    Evaluate a constraint expression as a boolean mask over all the candidate proposals at once.
+
+    :param constraint_expr: the constraint expression (Constraint, And or Or).
+    :param candidate_proposals: the candidate proposals.
+
+    :return: a boolean mask of shape (nb_candidates,), or None if the expression is not vectorizable.
+    """
+    if isinstance(constraint_expr, (And, Or)):
+        masks = [_constraint_mask(subexpr, candidate_proposals) for subexpr in constraint_expr.constraints]
+        if any(mask is None for mask in masks):
+            return None
+        reduction = np.logical_and if isinstance(constraint_expr, And) else np.logical_or
+        return reduction.reduce(masks)
+    if isinstance(constraint_expr, Constraint):
+        attribute_name = constraint_expr.attribute_name
+        constraint_type = constraint_expr.constraint
+        try:
+            attribute_values = [proposal.values[attribute_name] for proposal in candidate_proposals]
+        except KeyError:
+            return None
+        # Constraint.check is type-strict: a value whose Python type differs from the
+        # constraint's does not match. Only vectorize homogeneously-typed columns.
+        if isinstance(constraint_type, Range):
+            expected_type = type(constraint_type.values[0])
+            if type(constraint_type.values[1]) is not expected_type:
+                return None
+        elif isinstance(constraint_type, (Eq, NotEq, Lt, LtEq, Gt, GtEq)):
+            expected_type = type(constraint_type.value)
+        else:
+            return None
+        if any(type(value) is not expected_type for value in attribute_values):
+            return None
+        values = np.asarray(attribute_values)
+        try:
+            if isinstance(constraint_type, Eq):
+                return values == constraint_type.value
+            if isinstance(constraint_type, NotEq):
+                return values != constraint_type.value
+            if isinstance(constraint_type, Lt):
+                return values < constraint_type.value
+            if isinstance(constraint_type, LtEq):
+                return values <= constraint_type.value
+            if isinstance(constraint_type, Gt):
+                return values > constraint_type.value
+            if isinstance(constraint_type, GtEq):
+                return values >= constraint_type.value
+            lower, upper = constraint_type.values
+            return (values >= lower) & (values <= upper)
+        except TypeError:
+            return None
+    return None
+
+
+def _vectorized_query_filter(candidate_proposals: List[Description], query: CFP_TYPES) -> List[Description]:
+    """
+    Filter the candidate proposals with the query, evaluating constraints as vectorized masks where possible.
+
+    Constraint expressions which cannot be vectorized fall back to a per-proposal `query.check`.
+
+    :param candidate_proposals: the candidate proposals.
+    :param query: the query associated with the cfp.
+
+    :return: the proposals matching the query.
+    """
+    if not isinstance(query, Query) or not candidate_proposals:
+        return [proposal for proposal in candidate_proposals if query.check(proposal)]
+
+    mask = np.ones(len(candidate_proposals), dtype=bool)
+    for constraint_expr in query.constraints:
+        constraint_mask = _constraint_mask(constraint_expr, candidate_proposals)
+        if constraint_mask is None:
+            constraint_mask = np.fromiter((constraint_expr.check(proposal) for proposal in candidate_proposals),
+                                          dtype=bool, count=len(candidate_proposals))
+        mask &= constraint_mask
+    return [proposal for proposal, is_match in zip(candidate_proposals, mask) if is_match]
+
+
 class GamePhase(Enum):
     """This class defines the TAC game stages."""
 
@@ -48,19 +136,28 @@ class GamePhase(Enum):
     POST_GAME = 'post_game'
 
 
+class SearchRole(IntEnum):
+    """This class defines what a search was issued for."""
+
+    TAC = 0
+    SELLERS = 1
+    BUYERS = 2
+
+
 class Search:
     """This class deals with the search state."""
 
+    __slots__ = ('_id', '_counter', '_id_roles')
+
     def __init__(self):
         """Instantiate the search class."""
         self._id = 0
-        self.ids_for_tac = set()  # type: Set[int]
-        self.ids_for_sellers = set()  # type: Set[int]
-        self.ids_for_buyers = set()  # type: Set[int]
+        self._counter = itertools.count(1)
+        self._id_roles = {}  # type: Dict[int, SearchRole]
 
     @property
     def id(self) -> int:
-        """Get the search id."""
+        """Get the last issued search id."""
         return self._id
 
     def get_next_id(self) -> int:
@@ -69,13 +166,42 @@ class Search:
 
         :return: a search id
         """
-        self._id += 1
+        self._id = next(self._counter)
         return self._id
 
+    def register(self, search_id: int, role: SearchRole) -> None:
+        """
+        Register a search id with the role of the search.
+
+        :param search_id: the search id
+        :param role: the role of the search
+
+        :return: None
+        """
+        self._id_roles[search_id] = role
+
+    def role_of(self, search_id: int) -> Optional[SearchRole]:
+        """
+        Get the role a search id was issued for.
+
+        :param search_id: the search id
+
+        :return: the role, or None if the search id is unknown
+        """
+        return self._id_roles.get(search_id, None)
+
 
 class GameInstance:
     """The GameInstance maintains state of the game from the agent's perspective."""
 
+    __slots__ = ('agent_name', 'controller_pbk', '_strategy', '_search', '_dialogues', '_game_phase',
+                 '_game_configuration', '_initial_agent_state', '_agent_state', '_world_state',
+                 '_services_interval_s', '_last_update_time', '_last_search_time',
+                 'goods_supplied_description', 'goods_demanded_description',
+                 '_state_after_locks_cache', '_role_snapshot_cache', '_strategy_cache',
+                 '_desc_cache', '_query_cache',
+                 'lock_manager', 'stats_manager', 'dashboard')
+
     def __init__(self, agent_name: str,
                  strategy: Strategy,
                  mail_stats: MailStats,
@@ -109,13 +235,20 @@ class GameInstance:
         self._agent_state = None  # type: Optional[AgentState]
         self._world_state = None  # type: Optional[WorldState]
 
-        self._services_interval = datetime.timedelta(0, services_interval)
-        self._last_update_time = datetime.datetime.now() - self._services_interval
-        self._last_search_time = datetime.datetime.now() - datetime.timedelta(0, round(services_interval / 2.0))
+        self._services_interval_s = float(services_interval)
+        now = time.monotonic()
+        self._last_update_time = now - self._services_interval_s
+        self._last_search_time = now - round(self._services_interval_s / 2.0)
 
         self.goods_supplied_description = None
         self.goods_demanded_description = None
 
+        self._state_after_locks_cache = {}  # type: Dict[Tuple[int, bool], AgentState]
+        self._role_snapshot_cache = {}  # type: Dict[Tuple[int, bool], Tuple[AgentState, Set[str], List[int]]]
+        self._strategy_cache = OrderedDict()  # type: OrderedDict
+        self._desc_cache = OrderedDict()  # type: OrderedDict
+        self._query_cache = OrderedDict()  # type: OrderedDict
+
         self.lock_manager = LockManager(agent_name, pending_transaction_timeout=pending_transaction_timeout)
         self.lock_manager.start()
 
@@ -140,8 +273,7 @@ class GameInstance:
         self._initial_agent_state = AgentState(game_data.money, game_data.endowment, game_data.utility_params)
         self._agent_state = AgentState(game_data.money, game_data.endowment, game_data.utility_params)
         if self.strategy.is_world_modeling:
-            opponent_pbks = self.game_configuration.agent_pbks
-            opponent_pbks.remove(agent_pbk)
+            opponent_pbks = [pbk for pbk in self.game_configuration.agent_pbks if pbk != agent_pbk]
             self._world_state = WorldState(opponent_pbks, self.game_configuration.good_pbks, self.initial_agent_state)
 
     def on_state_update(self, state_update: StateUpdate, agent_pbk: str) -> None:
@@ -157,6 +289,8 @@ class GameInstance:
         self._game_phase = GamePhase.GAME
         for tx in state_update.transactions:
             self.agent_state.update(tx, state_update.initial_state.tx_fee)
+        self._state_after_locks_cache.clear()
+        self._role_snapshot_cache.clear()
 
     @property
     def strategy(self) -> Strategy:
@@ -201,16 +335,16 @@ class GameInstance:
     @property
     def services_interval(self) -> datetime.timedelta:
         """Get the services interval."""
-        return self._services_interval
+        return datetime.timedelta(0, self._services_interval_s)
 
     @property
-    def last_update_time(self) -> datetime.datetime:
-        """Get the last services update time."""
+    def last_update_time(self) -> float:
+        """Get the last services update time (in monotonic clock seconds)."""
         return self._last_update_time
 
     @property
-    def last_search_time(self) -> datetime.datetime:
-        """Get the last services search time."""
+    def last_search_time(self) -> float:
+        """Get the last services search time (in monotonic clock seconds)."""
         return self._last_search_time
 
     def is_time_to_update_services(self) -> bool:
@@ -219,8 +353,8 @@ class GameInstance:
 
         :return: bool indicating the action
         """
-        now = datetime.datetime.now()
-        result = now - self.last_update_time > self.services_interval
+        now = time.monotonic()
+        result = now - self._last_update_time > self._services_interval_s
         if result:
             self._last_update_time = now
         return result
@@ -231,8 +365,8 @@ class GameInstance:
 
         :return: bool indicating the action
         """
-        now = datetime.datetime.now()
-        result = now - self.last_search_time > self.services_interval
+        now = time.monotonic()
+        result = now - self._last_search_time > self._services_interval_s
         if result:
             self._last_search_time = now
         return result
@@ -245,9 +379,18 @@ class GameInstance:
 
         :return: the description (to advertise on the Service Directory).
         """
+        _, _, quantities = self._role_snapshot(is_supply)
+        key = (is_supply, tuple(quantities))  # good_pbks are stable for the game
+        desc = self._desc_cache.get(key, None)
+        if desc is not None:
+            self._desc_cache.move_to_end(key)
+            return desc
         desc = get_goods_quantities_description(self.game_configuration.good_pbks,
-                                                self.get_goods_quantities(is_supply),
+                                                quantities,
                                                 is_supply=is_supply)
+        self._desc_cache[key] = desc
+        if len(self._desc_cache) > SERVICES_CACHE_SIZE:
+            self._desc_cache.popitem(last=False)
         return desc
 
     def build_services_query(self, is_searching_for_sellers: bool) -> Optional[Query]:
@@ -262,11 +405,60 @@ class GameInstance:
 
         :return: the Query, or None.
         """
-        good_pbks = self.get_goods_pbks(is_supply=not is_searching_for_sellers)
-
-        res = None if len(good_pbks) == 0 else build_query(good_pbks, is_searching_for_sellers)
+        _, good_pbks, _ = self._role_snapshot(is_supply=not is_searching_for_sellers)
+        if len(good_pbks) == 0:
+            return None
+
+        key = (is_searching_for_sellers, tuple(sorted(good_pbks)))
+        res = self._query_cache.get(key, None)
+        if res is not None:
+            self._query_cache.move_to_end(key)
+            return res
+        res = build_query(good_pbks, is_searching_for_sellers)
+        self._query_cache[key] = res
+        if len(self._query_cache) > SERVICES_CACHE_SIZE:
+            self._query_cache.popitem(last=False)
         return res
 
+    def _role_snapshot(self, is_supply: bool) -> Tuple[AgentState, Set[str], List[int]]:
+        """
+        Compute the state after locks once and derive the good public keys and quantities for the role.
+
+        The snapshot is cached per (lock version, role), so the back-to-back calls of the
+        advertise + query cycle share a single state computation.
+
+        :param is_supply: Boolean indicating whether it is referencing the supplied or demanded side.
+
+        :return: the (state after locks, good public keys, good quantities) triple.
+        """
+        key = (self.lock_manager.version, is_supply)
+        snapshot = self._role_snapshot_cache.get(key, None)
+        if snapshot is not None:
+            return snapshot
+        state_after_locks = self.state_after_locks(is_seller=is_supply)
+        holdings = state_after_locks.current_holdings
+        # the strategy derivations are pure functions of the holdings, so they are
+        # memoized on a holdings-tuple key, surviving lock churn with unchanged holdings
+        holdings_key = (is_supply, tuple(holdings))
+        cached = self._strategy_cache.get(holdings_key, None)
+        if cached is not None:
+            self._strategy_cache.move_to_end(holdings_key)
+            good_pbks, quantities = cached
+        else:
+            if is_supply:
+                good_pbks = self.strategy.supplied_good_pbks(self.game_configuration.good_pbks, holdings)
+                quantities = self.strategy.supplied_good_quantities(holdings)
+            else:
+                good_pbks = self.strategy.demanded_good_pbks(self.game_configuration.good_pbks, holdings)
+                quantities = self.strategy.demanded_good_quantities(holdings)
+            self._strategy_cache[holdings_key] = (good_pbks, quantities)
+            if len(self._strategy_cache) > STRATEGY_CACHE_SIZE:
+                self._strategy_cache.popitem(last=False)
+        snapshot = (state_after_locks, good_pbks, quantities)
+        self._role_snapshot_cache = {k: v for k, v in self._role_snapshot_cache.items() if k[0] == key[0]}
+        self._role_snapshot_cache[key] = snapshot
+        return snapshot
+
     def get_goods_pbks(self, is_supply: bool) -> Set[str]:
         """
         Wrap the function which determines supplied and demanded good public keys.
@@ -275,8 +467,7 @@ class GameInstance:
 
         :return: a list of good public keys
         """
-        state_after_locks = self.state_after_locks(is_seller=is_supply)
-        good_pbks = self.strategy.supplied_good_pbks(self.game_configuration.good_pbks, state_after_locks.current_holdings) if is_supply else self.strategy.demanded_good_pbks(self.game_configuration.good_pbks, state_after_locks.current_holdings)
+        _, good_pbks, _ = self._role_snapshot(is_supply)
         return good_pbks
 
     def get_goods_quantities(self, is_supply: bool) -> List[int]:
@@ -287,8 +478,7 @@ class GameInstance:
 
         :return: the vector of good quantities offered/requested.
         """
-        state_after_locks = self.state_after_locks(is_seller=is_supply)
-        quantities = self.strategy.supplied_good_quantities(state_after_locks.current_holdings) if is_supply else self.strategy.demanded_good_quantities(state_after_locks.current_holdings)
+        _, _, quantities = self._role_snapshot(is_supply)
         return quantities
 
     def state_after_locks(self, is_seller: bool) -> AgentState:
@@ -296,14 +486,25 @@ class GameInstance:
         Apply all the locks to the current state of the agent.
 
         This assumes, that all the locked transactions will be successful.
+        The returned state is to be treated as read-only: with no locks it is the live agent state itself.
 
         :param is_seller: Boolean indicating the role of the agent.
 
         :return: the agent state with the locks applied to current state
         """
-        transactions = list(self.lock_manager.locks_as_seller.values()) if is_seller \
-            else list(self.lock_manager.locks_as_buyer.values())
+        version = self.lock_manager.version
+        key = (version, is_seller)
+        state_after_locks = self._state_after_locks_cache.get(key, None)
+        if state_after_locks is not None:
+            return state_after_locks
+        transactions = self.lock_manager.locks_as_seller_tuple if is_seller \
+            else self.lock_manager.locks_as_buyer_tuple
+        if not transactions:
+            return self._agent_state
         state_after_locks = self._agent_state.apply(transactions, self.game_configuration.tx_fee)
+        # evict entries from older lock versions; only the current version can be reused
+        self._state_after_locks_cache = {k: v for k, v in self._state_after_locks_cache.items() if k[0] == version}
+        self._state_after_locks_cache[key] = state_after_locks
         return state_after_locks
 
     def get_proposals(self, query: CFP_TYPES, is_seller: bool) -> List[Description]:
@@ -319,11 +520,8 @@ class GameInstance:
         """
         state_after_locks = self.state_after_locks(is_seller=is_seller)
         candidate_proposals = self.strategy.get_proposals(self.game_configuration.good_pbks, state_after_locks.current_holdings, state_after_locks.utility_params, self.game_configuration.tx_fee, is_seller, self._world_state)
-        proposals = []
-        for proposal in candidate_proposals:
-            if not query.check(proposal): continue
-            proposals.append(proposal)
-        if proposals == []:
+        proposals = _vectorized_query_filter(candidate_proposals, query)
+        if not proposals:
             proposals.append(candidate_proposals[0])  # TODO remove this
         return proposals
 
@@ -20,7 +20,6 @@
 
 """This module contains a class to manage locked agent states."""
 
-import datetime
 import logging
 import time
 from collections import defaultdict, deque
@@ -62,12 +61,41 @@ class LockManager(object):
         self.locks_as_buyer = {}  # type: Dict[TRANSACTION_ID, Transaction]
         self.locks_as_seller = {}  # type: Dict[TRANSACTION_ID, Transaction]
 
+        self._version = 0
+        self._locks_as_buyer_tuple = ()  # type: Tuple[Transaction, ...]
+        self._locks_as_seller_tuple = ()  # type: Tuple[Transaction, ...]
+
         self.pending_transaction_timeout = pending_transaction_timeout
         self._cleanup_locks_task = None
         self._cleanup_locks_task_is_running = False
         self._cleanup_locks_task_timeout = task_timeout
 
-        self._last_update_for_transactions = deque()  # type: Deque[Tuple[datetime.datetime, TRANSACTION_ID]]
+        self._last_update_for_transactions = deque()  # type: Deque[Tuple[float, TRANSACTION_ID]]
+
+    @property
+    def version(self) -> int:
+        """Get the version of the lock sets, incremented on every addition/removal of a lock."""
+        return self._version
+
+    @property
+    def locks_as_buyer_tuple(self) -> Tuple[Transaction, ...]:
+        """Get a pre-built snapshot of the locks as buyer."""
+        return self._locks_as_buyer_tuple
+
+    @property
+    def locks_as_seller_tuple(self) -> Tuple[Transaction, ...]:
+        """Get a pre-built snapshot of the locks as seller."""
+        return self._locks_as_seller_tuple
+
+    def _on_locks_changed(self) -> None:
+        """
+        Refresh the version and the lock snapshots after a mutation of the lock sets.
+
+        :return: None
+        """
+        self._version += 1
+        self._locks_as_buyer_tuple = tuple(self.locks_as_buyer.values())
+        self._locks_as_seller_tuple = tuple(self.locks_as_seller.values())
 
     def cleanup_locks_job(self) -> None:
         """
@@ -88,14 +116,14 @@ class LockManager(object):
         :return: None
         """
         queue = self._last_update_for_transactions
-        timeout = datetime.timedelta(0, self.pending_transaction_timeout)
+        timeout = float(self.pending_transaction_timeout)
 
         if len(queue) == 0:
             return
 
         next_date, next_item = queue[0]
 
-        while datetime.datetime.now() - next_date > timeout:
+        while time.monotonic() - next_date > timeout:
 
             # remove the element from the queue
             queue.popleft()
@@ -108,6 +136,7 @@ class LockManager(object):
             self.locks.pop(transaction_id, None)
             self.locks_as_buyer.pop(transaction_id, None)
             self.locks_as_seller.pop(transaction_id, None)
+            self._on_locks_changed()
 
             # check the next transaction, if present
             if len(queue) == 0:
@@ -122,7 +151,7 @@ class LockManager(object):
 
         :return: None
         """
-        now = datetime.datetime.now()
+        now = time.monotonic()
         self._last_update_for_transactions.append((now, transaction_id))
 
     def add_pending_proposal(self, dialogue: Dialogue, proposal_id: int, transaction: Transaction) -> None:
@@ -199,6 +228,7 @@ class LockManager(object):
             self.locks_as_seller[transaction_id] = transaction
         else:
             self.locks_as_buyer[transaction_id] = transaction
+        self._on_locks_changed()
 
     def pop_lock(self, transaction_id: str) -> Transaction:
         """
@@ -213,6 +243,7 @@ class LockManager(object):
         transaction = self.locks.pop(transaction_id)
         self.locks_as_buyer.pop(transaction_id, None)
         self.locks_as_seller.pop(transaction_id, None)
+        self._on_locks_changed()
         return transaction
 
     def start(self) -> None:
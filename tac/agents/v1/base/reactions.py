@@ -35,7 +35,7 @@ from oef.utils import Context
 
 from tac.agents.v1.agent import Liveness
 from tac.agents.v1.base.dialogues import Dialogue
-from tac.agents.v1.base.game_instance import GameInstance, GamePhase
+from tac.agents.v1.base.game_instance import GameInstance, GamePhase, SearchRole
 from tac.agents.v1.base.helpers import dialogue_label_from_transaction_id
 from tac.agents.v1.base.interfaces import ControllerReactionInterface, OEFSearchReactionInterface, \
     DialogueReactionInterface
@@ -222,11 +222,12 @@ class OEFReactions(OEFSearchReactionInterface):
         """
         search_id = search_result.msg_id
         logger.debug("[{}]: on search result: {} {}".format(self.agent_name, search_id, search_result.agents))
-        if search_id in self.game_instance.search.ids_for_tac:
+        role = self.game_instance.search.role_of(search_id)
+        if role == SearchRole.TAC:
             self._on_controller_search_result(search_result.agents)
-        elif search_id in self.game_instance.search.ids_for_sellers:
+        elif role == SearchRole.SELLERS:
             self._on_services_search_result(search_result.agents, is_searching_for_sellers=True)
-        elif search_id in self.game_instance.search.ids_for_buyers:
+        elif role == SearchRole.BUYERS:
             self._on_services_search_result(search_result.agents, is_searching_for_sellers=False)
         else:
             logger.debug("[{}]: Unknown search id: search_id={}".format(self.agent_name, search_id))
@@ -41,6 +41,13 @@ from oef.query import Query
 from oef.schema import Description
 from oef.utils import Context
 
+try:
+    # use uvloop as the event loop implementation for OEF message I/O, when available
+    import uvloop
+    uvloop.install()
+except ImportError:
+    pass
+
 logger = logging.getLogger(__name__)
 
 Action = Any
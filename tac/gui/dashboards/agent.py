@@ -6,8 +6,6 @@ import inspect
 import os
 from typing import Optional
 
-import numpy as np
-
 from tac.gui.dashboards.base import Dashboard
 from tac.helpers.misc import generate_html_table_from_dict, escape_html
 from tac.platform.game import AgentState
@@ -97,6 +95,7 @@ class AgentDashboard(Dashboard):
         self.viz.text(self._transaction_table.to_html(), win=self._transaction_window, env=self.env_name)
 
     def _update_holdings(self, agent_state: AgentState) -> None:
+        import numpy as np
 
         scaled_holdings = agent_state.current_holdings / np.sum(agent_state.current_holdings)
         scaled_utility_params = agent_state.utility_params / np.sum(agent_state.utility_params)
@@ -2,13 +2,19 @@
 
 """Module wrapping the visdom dashboard initialization."""
 
+import asyncio
 import inspect
 import os
-import subprocess
+import threading
 import time
-from typing import Optional
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional, TYPE_CHECKING
 
-from visdom import Visdom
+if TYPE_CHECKING:
+    import numpy as np
+    from visdom import Visdom
 
 CUR_PATH = inspect.getfile(inspect.currentframe())
 CUR_DIR = os.path.dirname(CUR_PATH)
@@ -22,17 +28,46 @@ class Dashboard(object):
                  visdom_port: int = 8097,
                  env_name: Optional[str] = None):
         """Initialize the dashboard."""
-        self._proc = None  # type: Optional[subprocess.Popen]
-        self.viz = None  # type: Optional[Visdom]
+        self.viz = None  # type: Optional['Visdom']
         self.visdom_addr = visdom_addr
         self.visdom_port = visdom_port
         self.env_name = env_name if env_name is not None else "default_env"
+        self._x_cache = None  # type: Optional['np.ndarray']
+        self._pool = ThreadPoolExecutor(max_workers=4)
+
+    def _update_panes(self, panes: List[Callable[[], None]]) -> None:
+        """
+        Run the pane update callables on the thread pool and wait for completion.
+
+        Each pane is an independent blocking HTTP round trip to the Visdom server (which
+        releases the GIL during socket I/O), so the sends overlap instead of paying one
+        network round trip after the other. Visdom's client is thread-safe for distinct windows.
+
+        :param panes: the pane update callables.
+
+        :return: None
+        """
+        list(self._pool.map(lambda update_pane: update_pane(), panes))
+
+    def _x_axis(self, n: int) -> 'np.ndarray':
+        """
+        Get the [0, n) x-axis array for line plots, re-allocating it only when it needs to grow.
+
+        :param n: the number of points to plot.
+
+        :return: an array of shape (n,).
+        """
+        import numpy as np
+        if self._x_cache is None or self._x_cache.shape[0] < n:
+            self._x_cache = np.arange(max(n, 64), dtype=np.int64)
+        return self._x_cache[:n]
 
     def _is_running(self):
         return self.viz is not None
 
     def start(self):
         """Start the dashboard."""
+        from visdom import Visdom
         self.viz = Visdom(server=self.visdom_addr, port=self.visdom_port, env=self.env_name)
 
     def stop(self):
@@ -40,11 +75,44 @@ class Dashboard(object):
         self.viz = None
 
 
-def start_visdom_server() -> subprocess.Popen:
-    """Start the visdom server."""
-    visdom_server_args = ["python", "-m", "visdom.server", "-env_path", os.path.join(CUR_DIR, "..", ".visdom_env")]
-    print(" ".join(visdom_server_args))
-    prog = subprocess.Popen(visdom_server_args, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-    time.sleep(1.0)
-    print("Visdom server running at http://localhost:8097")
-    return prog
+class VisdomServer:
+    """Handle to a visdom server running in a daemon thread of the current process."""
+
+    def __init__(self, thread: threading.Thread):
+        """Instantiate the handle."""
+        self._thread = thread
+
+    def terminate(self) -> None:
+        """Terminate the server. The daemon thread is stopped together with the process."""
+
+
+def _run_visdom_server(visdom_port: int, env_path: str) -> None:
+    """Run the visdom server; tornado requires the serving thread to have an event loop set."""
+    from visdom.server import start_server
+    asyncio.set_event_loop(asyncio.new_event_loop())
+    start_server(port=visdom_port, env_path=env_path)
+
+
+def start_visdom_server(visdom_addr: str = "localhost", visdom_port: int = 8097) -> VisdomServer:
+    """Start the visdom server in a daemon thread and wait until it answers HTTP requests."""
+    env_path = os.path.join(CUR_DIR, "..", ".visdom_env")
+    thread = threading.Thread(target=_run_visdom_server,
+                              args=(visdom_port, env_path),
+                              daemon=True)
+    thread.start()
+
+    # poll for readiness instead of sleeping a fixed amount of time
+    url = "http://{}:{}/env/list".format(visdom_addr, visdom_port)
+    deadline = time.time() + 5.0
+    while True:
+        try:
+            with urllib.request.urlopen(url, timeout=0.5):
+                break
+        except (urllib.error.URLError, OSError):
+            if time.time() >= deadline:
+                raise Exception("Visdom server did not come up at http://{}:{} within 5 seconds."
+                                .format(visdom_addr, visdom_port))
+            time.sleep(0.02)
+
+    print("Visdom server running at http://{}:{}".format(visdom_addr, visdom_port))
+    return VisdomServer(thread)
@@ -5,9 +5,7 @@
 import argparse
 import json
 import os
-from typing import Optional, Dict
-
-import numpy as np
+from typing import Optional, Dict, Tuple
 
 from tac.gui.dashboards.base import start_visdom_server, Dashboard
 from tac.helpers.crypto import Crypto
@@ -34,24 +32,40 @@ class ControllerDashboard(Dashboard):
         self.game_stats = game_stats
 
         self.agent_pbk_to_name = {}  # type: Dict[str, str]
+        self._last_rendered_state = None  # type: Optional[Tuple[Optional[int], Tuple[str, ...]]]
 
     def update(self):
-        """Update the dashboard."""
+        """
+        Update the dashboard.
+
+        Each pane is a blocking HTTP round trip to the Visdom server; when neither the registered
+        agents nor the settled transactions changed since the last render, all sends are skipped.
+        """
         if not self._is_running():
             raise Exception("Dashboard not running, update not allowed.")
 
-        self._update_registered_agents()
+        nb_transactions = len(self.game_stats.game.transactions) \
+            if self.game_stats is not None and self.game_stats.game is not None else None
+        state = (nb_transactions, tuple(self.agent_pbk_to_name.values()))
+        if state == self._last_rendered_state:
+            return
+
+        panes = [self._update_registered_agents]
         if self.game_stats is not None:
-            self._update_info()
-            self._update_utility_params()
-            self._update_current_holdings()
-            self._update_initial_holdings()
-            self._update_plot_scores()
-            self._update_plot_balance_history()
-            self._update_plot_price_history()
-            self._update_plot_eq_vs_mean_price()
-            self._update_plot_eq_vs_current_score()
-            self._update_adjusted_score()
+            panes.extend([
+                self._update_info,
+                self._update_utility_params,
+                self._update_current_holdings,
+                self._update_initial_holdings,
+                self._update_plot_scores,
+                self._update_plot_balance_history,
+                self._update_plot_price_history,
+                self._update_plot_eq_vs_mean_price,
+                self._update_plot_eq_vs_current_score,
+                self._update_adjusted_score,
+            ])
+        self._update_panes(panes)
+        self._last_rendered_state = state
 
     @staticmethod
     def from_datadir(datadir: str, env_name: str) -> 'ControllerDashboard':
@@ -85,6 +99,7 @@ class ControllerDashboard(Dashboard):
         ], env=self.env_name, win=window_name, opts=dict(title="Registered Agents"))
 
     def _update_utility_params(self):
+        import numpy as np
         utility_params = self.game_stats.game.initialization.utility_params
         utility_params = np.asarray(utility_params)
 
@@ -123,7 +138,7 @@ class ControllerDashboard(Dashboard):
         agent_names = [self.game_stats.game.configuration.agent_pbk_to_name[agent_pbk] for agent_pbk in keys]
 
         window_name = "score_history"
-        self.viz.line(X=np.arange(score_history.shape[0]), Y=score_history, env=self.env_name, win=window_name,
+        self.viz.line(X=self._x_axis(score_history.shape[0]), Y=score_history, env=self.env_name, win=window_name,
                       opts=dict(
                           legend=agent_names,
                           title="Scores",
@@ -136,7 +151,7 @@ class ControllerDashboard(Dashboard):
         agent_names = [self.game_stats.game.configuration.agent_pbk_to_name[agent_pbk] for agent_pbk in keys]
 
         window_name = "balance_history"
-        self.viz.line(X=np.arange(balance_history.shape[0]), Y=balance_history, env=self.env_name, win=window_name,
+        self.viz.line(X=self._x_axis(balance_history.shape[0]), Y=balance_history, env=self.env_name, win=window_name,
                       opts=dict(
                           legend=agent_names,
                           title="Balance history",
@@ -148,7 +163,7 @@ class ControllerDashboard(Dashboard):
         price_history = self.game_stats.price_history()
 
         window_name = "price_history"
-        self.viz.line(X=np.arange(price_history.shape[0]), Y=price_history, env=self.env_name, win=window_name,
+        self.viz.line(X=self._x_axis(price_history.shape[0]), Y=price_history, env=self.env_name, win=window_name,
                       opts=dict(
                           legend=list(self.game_stats.game.configuration.good_pbk_to_name.values()),
                           title="Price history",
@@ -29,6 +29,7 @@ import pylab as plt
 
 from tac.helpers.crypto import Crypto
 from tac.platform.game import Game, AgentState
+from tac.platform.stats_kernels import balance_history_kernel, holdings_history_kernel, score_history_kernel
 
 matplotlib.use('agg')
 
@@ -45,6 +46,7 @@ class GameStats:
         :return: None
         """
         self.game = game  # type: Optional[Game]
+        self._history_cache = {}  # type: Dict[str, Tuple[int, Any]]
 
     @classmethod
     def from_json(cls, d: Dict[str, Any]):
@@ -52,6 +54,38 @@ class GameStats:
         game = Game.from_dict(d, Crypto())  # any crypto object will do here
         return GameStats(game)
 
+    def _transaction_arrays(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Build (and cache) the column-wise representation of the settled transactions.
+
+        :return: the (buyer index, seller index, amount, quantities) arrays per transaction.
+        """
+        nb_transactions = len(self.game.transactions)
+        cached = self._history_cache.get('tx_arrays', None)
+        if cached is not None and cached[0] == nb_transactions:
+            return cached[1]
+
+        agent_idx = {agent_pbk: idx for idx, agent_pbk in enumerate(self.game.configuration.agent_pbks)}
+        buyer_idx = np.fromiter((agent_idx[tx.buyer_pbk] for tx in self.game.transactions),
+                                dtype=np.int64, count=nb_transactions)
+        seller_idx = np.fromiter((agent_idx[tx.seller_pbk] for tx in self.game.transactions),
+                                 dtype=np.int64, count=nb_transactions)
+        amounts = np.fromiter((tx.amount for tx in self.game.transactions),
+                              dtype=np.float64, count=nb_transactions)
+        quantities = np.asarray([list(tx.quantities_by_good_pbk.values()) for tx in self.game.transactions],
+                                dtype=np.int32).reshape(nb_transactions, self.game.configuration.nb_goods)
+
+        arrays = (buyer_idx, seller_idx, amounts, quantities)
+        self._history_cache['tx_arrays'] = (nb_transactions, arrays)
+        return arrays
+
+    def _balance_history_kernel(self) -> np.ndarray:
+        """Compute the (float) balance history via the vectorized kernel."""
+        buyer_idx, seller_idx, amounts, _ = self._transaction_arrays()
+        initial_balances = np.asarray(self.game.initialization.initial_money_amounts, dtype=np.float64)
+        share_of_tx_fee = round(self.game.configuration.tx_fee / 2.0, 2)
+        return balance_history_kernel(initial_balances, buyer_idx, seller_idx, amounts, share_of_tx_fee)
+
     def holdings_history(self):
         """
         Compute the history of holdings.
@@ -59,73 +93,47 @@ class GameStats:
         :return: a matrix of shape (nb_transactions, nb_agents, nb_goods). i=0 is the initial endowment matrix.
         """
         nb_transactions = len(self.game.transactions)
-        nb_agents = self.game.configuration.nb_agents
-        nb_goods = self.game.configuration.nb_goods
-        result = np.zeros((nb_transactions + 1, nb_agents, nb_goods), dtype=np.int32)
-
-        temp_game = Game(self.game.configuration, self.game.initialization)
+        cached = self._history_cache.get('holdings_history', None)
+        if cached is not None and cached[0] == nb_transactions:
+            return cached[1]
 
-        # initial holdings
-        result[0, :] = np.asarray(temp_game.initialization.endowments, dtype=np.int32)
-
-        # compute the partial scores for every agent after every transaction
-        # (remember that indexes of the transaction start from one, because index 0 is reserved for the initial scores)
-        for idx, tx in enumerate(self.game.transactions):
-            temp_game.settle_transaction(tx)
-            result[idx + 1, :] = np.asarray(temp_game.get_holdings_matrix(), dtype=np.int32)
+        buyer_idx, seller_idx, _, quantities = self._transaction_arrays()
+        endowments = np.asarray(self.game.initialization.endowments, dtype=np.int32)
+        result = holdings_history_kernel(endowments, buyer_idx, seller_idx, quantities)
 
+        self._history_cache['holdings_history'] = (nb_transactions, result)
         return result
 
     def score_history(self) -> Tuple[List[str], np.ndarray]:
         """
         Compute the history of the scores for every agent.
 
-        To do so, we need to simulate the game again, by settling transactions one by one
-        and get the scores after every transaction.
-
         :return: a matrix of shape (nb_transactions + 1, nb_agents), where every row i contains the scores
                  after transaction i (i=0 is a row with the initial scores.)
         """
         nb_transactions = len(self.game.transactions)
-        nb_agents = self.game.configuration.nb_agents
-        result = np.zeros((nb_transactions + 1, nb_agents))
+        keys = list(self.game.configuration.agent_pbks)
+        cached = self._history_cache.get('score_history', None)
+        if cached is not None and cached[0] == nb_transactions:
+            return keys, cached[1]
 
-        temp_game = Game(self.game.configuration, self.game.initialization)
-
-        # initial scores
-        scores_dict = temp_game.get_scores()
-        result[0, :] = list(scores_dict.values())
-        keys = list(scores_dict.keys())
-
-        # compute the partial scores for every agent after every transaction
-        # (remember that indexes of the transaction start from one, because index 0 is reserved for the initial scores)
-        for idx, tx in enumerate(self.game.transactions):
-            temp_game.settle_transaction(tx)
-            scores_dict = temp_game.get_scores()
-            result[idx + 1, :] = list(scores_dict.values())
+        utility_params = np.asarray(self.game.initialization.utility_params, dtype=np.float64)
+        result = score_history_kernel(utility_params, self.holdings_history(), self._balance_history_kernel())
 
+        self._history_cache['score_history'] = (nb_transactions, result)
         return keys, result
 
     def balance_history(self) -> Tuple[List[str], np.ndarray]:
         """Get the balance history."""
         nb_transactions = len(self.game.transactions)
-        nb_agents = self.game.configuration.nb_agents
-        result = np.zeros((nb_transactions + 1, nb_agents), dtype=np.int32)
-
-        temp_game = Game(self.game.configuration, self.game.initialization)
-
-        # initial balances
-        balances_dict = temp_game.get_balances()
-        result[0, :] = np.asarray(list(balances_dict.values()), dtype=np.int32)
-        keys = list(balances_dict.keys())
+        keys = list(self.game.configuration.agent_pbks)
+        cached = self._history_cache.get('balance_history', None)
+        if cached is not None and cached[0] == nb_transactions:
+            return keys, cached[1]
 
-        # compute the partial scores for every agent after every transaction
-        # (remember that indexes of the transaction start from one, because index 0 is reserved for the initial scores)
-        for idx, tx in enumerate(self.game.transactions):
-            temp_game.settle_transaction(tx)
-            balances_dict = temp_game.get_balances()
-            result[idx + 1, :] = np.asarray(list(balances_dict.values()), dtype=np.int32)
+        result = self._balance_history_kernel().astype(np.int32)
 
+        self._history_cache['balance_history'] = (nb_transactions, result)
         return keys, result
 
     def price_history(self) -> np.ndarray:
@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2018-2019 Fetch.AI Limited
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""This module contains vectorized kernels for the per-transaction history computations of GameStats."""
+
+import numpy as np
+
+
+def holdings_history_kernel(endowments: np.ndarray, tx_buyer_idx: np.ndarray, tx_seller_idx: np.ndarray,
+                            tx_quantities: np.ndarray) -> np.ndarray:
+    """
+    Compute the holdings matrix after every transaction.
+
+    :param endowments: the initial endowments, of shape (nb_agents, nb_goods).
+    :param tx_buyer_idx: the buyer agent index per transaction, of shape (nb_transactions,).
+    :param tx_seller_idx: the seller agent index per transaction, of shape (nb_transactions,).
+    :param tx_quantities: the exchanged good quantities per transaction, of shape (nb_transactions, nb_goods).
+
+    :return: a matrix of shape (nb_transactions + 1, nb_agents, nb_goods). i=0 is the initial endowment matrix.
+    """
+    nb_transactions = tx_quantities.shape[0]
+    result = np.empty((nb_transactions + 1,) + endowments.shape, dtype=np.int32)
+    result[0, :] = endowments
+    if nb_transactions == 0:
+        return result
+
+    deltas = np.zeros((nb_transactions,) + endowments.shape, dtype=np.int32)
+    rows = np.arange(nb_transactions)
+    deltas[rows, tx_buyer_idx, :] += tx_quantities
+    deltas[rows, tx_seller_idx, :] -= tx_quantities
+    result[1:, :] = endowments + np.cumsum(deltas, axis=0)
+    return result
+
+
+def balance_history_kernel(initial_balances: np.ndarray, tx_buyer_idx: np.ndarray, tx_seller_idx: np.ndarray,
+                           tx_amounts: np.ndarray, share_of_tx_fee: float) -> np.ndarray:
+    """
+    Compute the money balances after every transaction.
+
+    :param initial_balances: the initial money amounts, of shape (nb_agents,).
+    :param tx_buyer_idx: the buyer agent index per transaction, of shape (nb_transactions,).
+    :param tx_seller_idx: the seller agent index per transaction, of shape (nb_transactions,).
+    :param tx_amounts: the money amount per transaction, of shape (nb_transactions,).
+    :param share_of_tx_fee: the share of the transaction fee each side pays.
+
+    :return: a matrix of shape (nb_transactions + 1, nb_agents). i=0 is the row of initial balances.
+    """
+    nb_transactions = tx_amounts.shape[0]
+    result = np.empty((nb_transactions + 1,) + initial_balances.shape, dtype=np.float64)
+    result[0, :] = initial_balances
+    if nb_transactions == 0:
+        return result
+
+    deltas = np.zeros((nb_transactions,) + initial_balances.shape, dtype=np.float64)
+    rows = np.arange(nb_transactions)
+    deltas[rows, tx_buyer_idx] -= tx_amounts + share_of_tx_fee
+    deltas[rows, tx_seller_idx] += tx_amounts - share_of_tx_fee
+    result[1:, :] = initial_balances + np.cumsum(deltas, axis=0)
+    return result
+
+
+def score_history_kernel(utility_params: np.ndarray, holdings_history: np.ndarray,
+                         balance_history: np.ndarray) -> np.ndarray:
+    """
+    Compute the agent scores after every transaction.
+
+    The score of an agent is the logarithmic utility of her good holdings
+    (with -10000 per good with zero quantity) plus the money balance.
+
+    :param utility_params: the utility params, of shape (nb_agents, nb_goods).
+    :param holdings_history: the holdings history, of shape (nb_transactions + 1, nb_agents, nb_goods).
+    :param balance_history: the balance history, of shape (nb_transactions + 1, nb_agents).
+
+    :return: a matrix of shape (nb_transactions + 1, nb_agents). i=0 is the row of initial scores.
+    """
+    goodwise_utility = np.where(holdings_history > 0,
+                                utility_params * np.log(np.maximum(holdings_history, 1)),
+                                -10000.0)
+    return goodwise_utility.sum(axis=2) + balance_history
@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2018-2019 Fetch.AI Limited
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""This module contains the tests of the game instance module."""
+
+from oef.query import And, Constraint, Eq, Gt, GtEq, Lt, Or, Query, Range
+from oef.schema import Description
+
+from tac.agents.v1.base.game_instance import _vectorized_query_filter
+
+
+def _make_proposals():
+    """Build a list of candidate proposals over two integer good attributes and a float price."""
+    return [
+        Description({"tac_good_0": 0, "tac_good_1": 2, "price": 1.0}),
+        Description({"tac_good_0": 1, "tac_good_1": 0, "price": 2.5}),
+        Description({"tac_good_0": 2, "tac_good_1": 1, "price": 4.0}),
+        Description({"tac_good_0": 3, "tac_good_1": 3, "price": 0.5}),
+    ]
+
+
+def _assert_same_as_check(proposals, query):
+    """Assert that the vectorized filter selects exactly the proposals query.check selects."""
+    expected = [proposal for proposal in proposals if query.check(proposal)]
+    actual = _vectorized_query_filter(proposals, query)
+    assert actual == expected
+
+
+def test_vectorized_query_filter_matches_check_on_relations():
+    """Test that the vectorized filter agrees with query.check for relation constraints."""
+    proposals = _make_proposals()
+    _assert_same_as_check(proposals, Query([Constraint("tac_good_0", GtEq(1))]))
+    _assert_same_as_check(proposals, Query([Constraint("tac_good_1", Eq(0))]))
+    _assert_same_as_check(proposals, Query([Constraint("tac_good_0", Gt(0)), Constraint("tac_good_1", Lt(3))]))
+    _assert_same_as_check(proposals, Query([Constraint("price", Range((1.0, 3.0)))]))
+
+
+def test_vectorized_query_filter_matches_check_on_logical_combinations():
+    """Test that the vectorized filter agrees with query.check for And/Or combinations."""
+    proposals = _make_proposals()
+    _assert_same_as_check(proposals, Query([Or([Constraint("tac_good_0", GtEq(2)), Constraint("tac_good_1", GtEq(2))])]))
+    _assert_same_as_check(proposals, Query([And([Constraint("tac_good_0", GtEq(1)), Constraint("price", Lt(3.0))])]))
+
+
+def test_vectorized_query_filter_matches_check_on_mixed_types():
+    """Test that type-mismatched constraints match nothing, exactly as the type-strict query.check."""
+    proposals = _make_proposals()
+    # float constraint on an integer attribute: check() matches nothing
+    _assert_same_as_check(proposals, Query([Constraint("tac_good_0", GtEq(1.0))]))
+    # string ordering constraint on an integer attribute: must not raise, and match nothing
+    _assert_same_as_check(proposals, Query([Constraint("tac_good_0", Gt("a"))]))
+    # int constraint on a float attribute
+    _assert_same_as_check(proposals, Query([Constraint("price", Lt(3))]))
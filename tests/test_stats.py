@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+# ------------------------------------------------------------------------------
+#
+#   Copyright 2018-2019 Fetch.AI Limited
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+#
+# ------------------------------------------------------------------------------
+
+"""This module contains the tests of the stats module."""
+
+import numpy as np
+
+from tac.helpers.crypto import Crypto
+from tac.platform.game import Game, GameConfiguration, GameInitialization
+from tac.platform.protocol import Transaction
+from tac.platform.stats import GameStats
+
+
+def _make_game() -> Game:
+    """Build a small game with three agents and three goods."""
+    nb_agents = 3
+    nb_goods = 3
+    tx_fee = 1.0
+    agent_pbk_to_name = {'tac_agent_0_pbk': 'tac_agent_0', 'tac_agent_1_pbk': 'tac_agent_1', 'tac_agent_2_pbk': 'tac_agent_2'}
+    good_pbk_to_name = {'tac_good_0': 'Good 0', 'tac_good_1': 'Good 1', 'tac_good_2': 'Good 2'}
+    money_amounts = [20, 20, 20]
+    endowments = [
+        [1, 1, 1],
+        [2, 1, 1],
+        [1, 1, 2]]
+    utility_params = [
+        [20.0, 40.0, 40.0],
+        [10.0, 50.0, 40.0],
+        [40.0, 30.0, 30.0]]
+    eq_prices = [1.0, 2.0, 2.0]
+    eq_good_holdings = [
+        [1.0, 1.0, 1.0],
+        [2.0, 1.0, 1.0],
+        [1.0, 1.0, 2.0]]
+    eq_money_holdings = [20.0, 20.0, 20.0]
+    game_configuration = GameConfiguration(nb_agents, nb_goods, tx_fee, agent_pbk_to_name, good_pbk_to_name)
+    game_initialization = GameInitialization(money_amounts, endowments, utility_params,
+                                             eq_prices, eq_good_holdings, eq_money_holdings)
+    return Game(game_configuration, game_initialization)
+
+
+def _make_transactions():
+    """Build a sequence of transactions which are valid for the game of _make_game, in order."""
+    crypto = Crypto()
+    return [
+        Transaction('tx_01', True, 'tac_agent_1_pbk', 15, {'tac_good_0': 1, 'tac_good_1': 0, 'tac_good_2': 0}, 'tac_agent_0_pbk', crypto),
+        Transaction('tx_02', True, 'tac_agent_0_pbk', 3, {'tac_good_0': 0, 'tac_good_1': 0, 'tac_good_2': 1}, 'tac_agent_2_pbk', crypto),
+        Transaction('tx_03', True, 'tac_agent_2_pbk', 2, {'tac_good_0': 0, 'tac_good_1': 1, 'tac_good_2': 0}, 'tac_agent_1_pbk', crypto),
+    ]
+
+
+def _reference_histories(game: Game):
+    """Re-simulate the game transaction by transaction and collect the per-step histories."""
+    temp_game = Game(game.configuration, game.initialization)
+    holdings = [np.asarray(temp_game.get_holdings_matrix(), dtype=np.int32)]
+    scores = [list(temp_game.get_scores().values())]
+    balances = [np.asarray(list(temp_game.get_balances().values()), dtype=np.int32)]
+    for tx in game.transactions:
+        temp_game.settle_transaction(tx)
+        holdings.append(np.asarray(temp_game.get_holdings_matrix(), dtype=np.int32))
+        scores.append(list(temp_game.get_scores().values()))
+        balances.append(np.asarray(list(temp_game.get_balances().values()), dtype=np.int32))
+    return np.asarray(holdings), np.asarray(scores), np.asarray(balances)
+
+
+class TestGameStatsHistories:
+    """Class to test the history computations of the game stats class."""
+
+    def test_histories_match_step_by_step_settlement(self):
+        """Test that the vectorized histories equal the per-transaction reference simulation."""
+        game = _make_game()
+        for tx in _make_transactions():
+            game.settle_transaction(tx)
+        game_stats = GameStats(game)
+
+        expected_holdings, expected_scores, expected_balances = _reference_histories(game)
+
+        assert np.array_equal(game_stats.holdings_history(), expected_holdings)
+
+        keys, score_history = game_stats.score_history()
+        assert keys == list(game.configuration.agent_pbks)
+        assert np.allclose(score_history, expected_scores)
+
+        keys, balance_history = game_stats.balance_history()
+        assert keys == list(game.configuration.agent_pbks)
+        assert np.array_equal(balance_history, expected_balances)
+
+    def test_histories_refresh_after_new_transaction(self):
+        """Test that the per-transaction-count cache returns fresh values after a new transaction."""
+        game = _make_game()
+        transactions = _make_transactions()
+        for tx in transactions[:-1]:
+            game.settle_transaction(tx)
+        game_stats = GameStats(game)
+
+        assert game_stats.holdings_history().shape[0] == len(transactions[:-1]) + 1
+        _, score_history = game_stats.score_history()
+        assert score_history.shape[0] == len(transactions[:-1]) + 1
+
+        game.settle_transaction(transactions[-1])
+
+        expected_holdings, expected_scores, expected_balances = _reference_histories(game)
+        assert np.array_equal(game_stats.holdings_history(), expected_holdings)
+        _, score_history = game_stats.score_history()
+        assert np.allclose(score_history, expected_scores)
+        _, balance_history = game_stats.balance_history()
+        assert np.array_equal(balance_history, expected_balances)
+
+    def test_histories_with_no_transactions(self):
+        """Test the histories of a game without any settled transaction."""
+        game = _make_game()
+        game_stats = GameStats(game)
+
+        holdings_history = game_stats.holdings_history()
+        assert holdings_history.shape == (1, game.configuration.nb_agents, game.configuration.nb_goods)
+        assert np.array_equal(holdings_history[0], np.asarray(game.initialization.endowments, dtype=np.int32))
+
+        _, score_history = game_stats.score_history()
+        assert score_history.shape == (1, game.configuration.nb_agents)
+
+        _, balance_history = game_stats.balance_history()
+        assert np.array_equal(balance_history[0], np.asarray(game.initialization.initial_money_amounts, dtype=np.int32))